@@ -9,19 +9,24 @@ Usage:
 """
 
 import os
+import re
 import ssl
-import json
 import math
+import time
+import functools
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 
+import bottleneck as bn
 import numpy as np
+import orjson
 import pandas as pd
 import yfinance as yf
 from dotenv import load_dotenv
 from fredapi import Fred
-from scipy.stats import percentileofscore
 
 warnings.filterwarnings("ignore")
 
@@ -42,7 +47,13 @@ fred = Fred(api_key=FRED_API_KEY)
 TODAY = datetime.today().date()
 START_5Y = TODAY - timedelta(days=365 * 5 + 90)   # 5Y + buffer for rolling
 START_RAW = TODAY - timedelta(days=365 * 5 + 200)
+# Window cutoffs as datetime64, computed once for searchsorted on sorted indexes
+CUTOFF_5Y    = np.datetime64(pd.Timestamp(TODAY - timedelta(days=365 * 5)), "ns")
+CUTOFF_SCORE = np.datetime64(pd.Timestamp(START_5Y), "ns")   # score history window
 OUTPUT_PATH = Path(__file__).parent.parent / "public" / "data" / "dashboard.json"
+CACHE_DIR = Path(__file__).parent / ".cache"   # per-day download cache (gitignored)
+CACHE_KEEP_DAYS = 2
+CACHE_TTL_HOURS = 12   # refresh today's copy once it is older than this
 
 # ── Module weights ───────────────────────────────────────────────────────────
 
@@ -121,25 +132,68 @@ def safe_last(s: pd.Series, fallback=float("nan")):
 
 
 def rel_log_return(price_a: pd.Series, price_b: pd.Series, window: int = 63) -> pd.Series:
-    """Relative log return: log(A/A[-window]) - log(B/B[-window])."""
-    la = np.log(price_a)
-    lb = np.log(price_b)
-    return (la - la.shift(window)) - (lb - lb.shift(window))
+    """Relative log return: log(A/A[-window]) - log(B/B[-window]), on shared dates."""
+    df = pd.concat([price_a, price_b], axis=1, join="inner")
+    logs = np.log(df.to_numpy())
+    out = np.full(len(df), np.nan, dtype=logs.dtype)
+    if len(df) > window:
+        out[window:] = (logs[window:, 0] - logs[:-window, 0]) - (logs[window:, 1] - logs[:-window, 1])
+    return pd.Series(out, index=df.index)
+
+
+def to_daily(series: pd.Series) -> pd.Series:
+    """Forward-fill a weekly/daily series onto the shared rate-market calendar."""
+    return series.reindex(CALENDAR, method="ffill")
+
+
+def rolling_std(series: pd.Series, window: int) -> pd.Series:
+    """
+    series.rolling(window).std() via bottleneck's sliding-window kernel. Flat
+    windows come out exactly 0: running-sum kernels leave 1e-10..1e-9 of residue
+    there that depends on earlier data, which reorders ranks on spreads that
+    sit unchanged for weeks.
+    """
+    if len(series) < window:   # bottleneck raises here; pandas returns all-NaN
+        return pd.Series(np.nan, index=series.index, dtype=np.float64)
+    # Accumulate in float64 (running sums cancel badly in float32) and keep the
+    # float64 result: these vols are ranking keys, and a float32 cast merges ties
+    arr = series.to_numpy(dtype=np.float64)
+    std = bn.move_std(arr, window, min_count=window, ddof=1)
+    std[bn.move_max(arr, window, min_count=window) == bn.move_min(arr, window, min_count=window)] = 0.0
+    return pd.Series(std, index=series.index)
+
+
+def rolling_median(series: pd.Series, window: int) -> pd.Series:
+    """Same as series.rolling(window).median(), via bottleneck's double-heap kernel."""
+    if len(series) < window:   # bottleneck raises here; pandas returns all-NaN
+        return pd.Series(np.nan, index=series.index, dtype=series.dtype)
+    return pd.Series(bn.move_median(series.to_numpy(), window, min_count=window), index=series.index)
 
 
 def realized_vol(returns: pd.Series, window: int, annualize: int = 252) -> pd.Series:
     """Rolling realized volatility, annualized."""
-    return returns.rolling(window).std() * math.sqrt(annualize)
+    return rolling_std(returns, window) * math.sqrt(annualize)
+
 
+def pct_of_score(sorted_arr: np.ndarray, x):
+    """percentileofscore(kind="rank") of x (scalar or array) in a sorted array."""
+    left = np.searchsorted(sorted_arr, x, side="left")
+    right = np.searchsorted(sorted_arr, x, side="right")
+    return (left + right + (left < right)) * 50.0 / len(sorted_arr)
 
-def pct_rank(series: pd.Series, lookback_years: int = 5) -> float:
-    """Current percentile within the past N years of daily data."""
-    cutoff = TODAY - timedelta(days=lookback_years * 365)
-    hist = series[series.index >= pd.Timestamp(cutoff)].dropna()
-    if len(hist) < 2:
+
+def pct_rank_sorted(sorted_hist: np.ndarray, current: float) -> float:
+    """Percentile of current within an already-sorted history (50 if too short)."""
+    if len(sorted_hist) < 2:
         return 50.0
-    current = float(hist.iloc[-1])
-    return float(percentileofscore(hist.values, current, kind="rank"))
+    return float(pct_of_score(sorted_hist, current))
+
+
+def pct_rank(series: pd.Series) -> float:
+    """Current percentile within the past 5 years of daily data."""
+    hist = series.to_numpy(dtype=np.float64)[np.searchsorted(series.index.values, CUTOFF_5Y):]
+    hist = hist[~np.isnan(hist)]
+    return pct_rank_sorted(np.sort(hist), hist[-1] if len(hist) else np.nan)
 
 
 def score_from_pct(raw_pct: float, factor_id: str) -> float:
@@ -147,6 +201,15 @@ def score_from_pct(raw_pct: float, factor_id: str) -> float:
     return round(max(0.0, min(100.0, score)), 1)
 
 
+def score_of(raw_pct: np.ndarray, invert) -> np.ndarray:
+    """Vector form of score_from_pct; invert is a bool or a per-element bool mask."""
+    # One output buffer, every step in place (no per-step temporaries)
+    score = np.array(raw_pct, dtype=np.float64)
+    np.subtract(100.0, score, out=score, where=np.broadcast_to(invert, score.shape))
+    np.clip(score, 0.0, 100.0, out=score)
+    return np.round(score, 1, out=score)
+
+
 def get_status(score: float) -> str:
     if score >= 66:
         return "supportive"
@@ -155,13 +218,11 @@ def get_status(score: float) -> str:
     return "restrictive"
 
 
-def get_velocity(series: pd.Series, window: int = 7) -> str:
-    s = series.dropna()
-    if len(s) < window + 1:
+def get_velocity(scores: np.ndarray, window: int = 7) -> str:
+    """Direction of a NaN-free score array over the last `window` points."""
+    if scores.size < window + 1:
         return "flat"
-    now = float(s.iloc[-1])
-    past = float(s.iloc[-window - 1])
-    diff = now - past
+    diff = scores[-1] - scores[-window - 1]
     if diff > 2:
         return "rising"
     if diff < -2:
@@ -169,34 +230,46 @@ def get_velocity(series: pd.Series, window: int = 7) -> str:
     return "flat"
 
 
-def build_trend_data(series: pd.Series, days: int = 90) -> list:
-    """Last N days of (date, value) for the frontend trend chart."""
-    s = series.dropna().tail(days)
-    result = []
-    for dt, val in s.items():
-        result.append({
-            "date": pd.Timestamp(dt).strftime("%-m/%-d"),
-            "value": round(float(val), 4),
-        })
-    return result
+def nearest_position(index: pd.DatetimeIndex, target) -> int:
+    """
+    Position of the date nearest to target in a sorted DatetimeIndex — same
+    result as index.get_indexer([target], method="nearest"), ties going to the
+    later date, but a binary search instead of building an index engine.
+    """
+    dates = index.values
+    target = np.datetime64(pd.Timestamp(target))
+    right = int(np.searchsorted(dates, target, side="left"))   # first date >= target
+    if right == len(dates):
+        return right - 1
+    if dates[right] == target or right == 0:
+        return right
+    left = right - 1
+    return left if target - dates[left] < dates[right] - target else right
+
+
+def build_trend_data(values: np.ndarray, index: pd.DatetimeIndex, days: int = 90) -> list:
+    """Last N days of (date, value) for the frontend trend chart (NaN-free input)."""
+    idx = index[-days:]
+    # "M/D" from the integer month/day arrays; DatetimeIndex.strftime goes through
+    # one Timestamp per element (and "%-m" is glibc-only)
+    dates = [f"{m}/{d}" for m, d in zip(idx.month.tolist(), idx.day.tolist())]
+    vals = values[-days:].tolist()
+    # Python round() is correctly rounded; np.round drifts on large values
+    return [{"date": d, "value": round(v, 4)} for d, v in zip(dates, vals)]
 
 
 def build_score_trend(score_series: pd.Series, days: int = 90) -> list:
     """Trend data for module/overall score history."""
-    return build_trend_data(score_series, days)
+    return build_trend_data(score_series.to_numpy(dtype=np.float64), score_series.index, days)
 
 
-def percentile_dist(series: pd.Series, lookback_years: int = 5) -> list:
-    """10-bucket histogram of historical distribution."""
-    cutoff = TODAY - timedelta(days=lookback_years * 365)
-    hist = series[series.index >= pd.Timestamp(cutoff)].dropna()
-    buckets = [f"{i*10}-{(i+1)*10}" for i in range(10)]
-    result = []
-    for i, label in enumerate(buckets):
-        lo, hi = i * 10, (i + 1) * 10
-        mask = (hist >= np.percentile(hist, lo)) & (hist < np.percentile(hist, min(hi, 99.9)))
-        result.append({"range": label, "freq": int(mask.sum())})
-    return result
+def percentile_dist(sorted_hist: np.ndarray) -> list:
+    """10-bucket histogram of historical distribution (sorted 5Y history)."""
+    # All bucket edges in one quantile call; the top edge stays at p99.9
+    edges = np.percentile(sorted_hist, [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 99.9])
+    # Bucket i counts edges[i] <= x < edges[i+1]
+    counts = np.diff(np.searchsorted(sorted_hist, edges, side="left"))
+    return [{"range": f"{i*10}-{(i+1)*10}", "freq": int(counts[i])} for i in range(10)]
 
 
 def fmt_value(val: float, prefix: str = "", suffix: str = "", decimals: int = 2) -> str:
@@ -225,57 +298,166 @@ def fmt_change(val: float, prev: float, unit: str = "%", bps: bool = False) -> t
 
 # ── Fetch raw data ────────────────────────────────────────────────────────────
 
-print("Fetching FRED data...")
+print("Fetching FRED + Yahoo Finance data...")
+
+def cache_file(key: str, day=TODAY) -> Path:
+    safe_key = re.sub(r"[^\w.-]", "", key)
+    return CACHE_DIR / f"{safe_key}_{day:%Y%m%d}.pkl"
 
-def fetch_fred(series_id: str, **kwargs) -> pd.Series:
+
+def prune_cache():
+    """Drop cache files (and stray temp files) older than CACHE_KEEP_DAYS."""
+    oldest = f"{TODAY - timedelta(days=CACHE_KEEP_DAYS):%Y%m%d}"
+    for p in CACHE_DIR.glob("*"):
+        m = re.search(r"_(\d{8})\.", p.name)
+        if m and m.group(1) < oldest:
+            p.unlink(missing_ok=True)
+
+
+def read_cache(path: Path):
+    """Load a cache file; a truncated or unreadable file counts as a miss (None)."""
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        return None
+
+
+def write_cache(data, path: Path):
+    """Write via a temp file + os.replace, so an interrupted run never leaves a partial pickle."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    data.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def disk_cached(incremental: bool = False):
+    """
+    Cache fetch(key, start) results in data/.cache/{key}_{YYYYMMDD}.pkl.
+    Today's file is returned without touching the network while it is younger
+    than CACHE_TTL_HOURS. Once it expires, incremental=True tops it up by fetching
+    only from its last date on. History is never carried over from an earlier
+    day: FRED revises past observations (NFCI is re-estimated weekly, H.4.1 gets
+    restated), so the first run of each day refetches the full window. Older
+    files are only served when that fetch fails.
+    """
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(key, start=START_RAW):
+            key_str = key if isinstance(key, str) else "_".join(key)
+            today_path = cache_file(key_str)
+            cached = read_cache(today_path) if today_path.exists() else None
+            if cached is not None and time.time() - today_path.stat().st_mtime < CACHE_TTL_HOURS * 3600:
+                return cached
+
+            if incremental and cached is not None and len(cached):
+                new = fetch(key, start=cached.index[-1].date())
+                if len(new) == 0:
+                    # Failed or nothing new: serve today's copy, retry next run
+                    return cached
+                data = pd.concat([cached, new])
+                data = data[~data.index.duplicated(keep="last")]
+                data = data[data.index >= pd.Timestamp(start)]
+            else:
+                data = fetch(key, start)
+
+            if len(data) == 0:
+                # Fetch failed: fall back to the newest readable copy, retry next run
+                stem = today_path.stem.rsplit("_", 1)[0]
+                for path in sorted(CACHE_DIR.glob(f"{stem}_*.pkl"), reverse=True):
+                    old = read_cache(path)
+                    if old is not None and len(old):
+                        return old[old.index >= pd.Timestamp(start)]
+                return data
+
+            write_cache(data, today_path)
+            return data
+        return wrapper
+    return decorator
+
+
+@disk_cached(incremental=True)
+def fetch_fred(series_id: str, start=START_RAW, **kwargs) -> pd.Series:
     empty = pd.Series(dtype=float, index=pd.DatetimeIndex([]))
     try:
-        s = fred.get_series(series_id, observation_start=str(START_RAW), **kwargs)
+        s = fred.get_series(series_id, observation_start=str(start), **kwargs)
         s.index = pd.to_datetime(s.index)
-        return s.dropna()
+        return s.dropna().astype(np.float32)   # <7 sig figs; halves memory traffic
     except Exception as e:
         print(f"  WARN: FRED {series_id} failed: {e}")
         return empty
 
-# Balance sheet / liquidity (weekly, fill forward to daily)
-walcl   = fetch_fred("WALCL").resample("D").last().ffill()   # $M → convert to $T
-wdtgal  = fetch_fred("WDTGAL").resample("D").last().ffill()  # $M
-rrp     = fetch_fred("RRPONTSYD")                             # $B daily
-wresbal = fetch_fred("WRESBAL").resample("D").last().ffill()  # $M
-
-# Rates (daily)
-dff   = fetch_fred("DFF")   / 100   # %→ decimal
-sofr  = fetch_fred("SOFR")  / 100
-iorb  = fetch_fred("IORB")  / 100
-obfr  = fetch_fred("OBFR")  / 100
-dgs10 = fetch_fred("DGS10") / 100
-dgs2  = fetch_fred("DGS2")  / 100
-dgs30 = fetch_fred("DGS30") / 100
-dgs3m = fetch_fred("DGS3MO")/ 100
-dfii5  = fetch_fred("DFII5") / 100
-dfii10 = fetch_fred("DFII10")/ 100
-t10yie = fetch_fred("T10YIE")/ 100
-dcpf3m = fetch_fred("DCPF3M")/ 100   # 90d AA CP rate
-nfci   = fetch_fred("NFCI").resample("D").last().ffill()
-wti    = fetch_fred("DCOILWTICO")
-ng     = fetch_fred("DHHNGSP")
 
-# ON RRP award rate = lower bound of fed funds target range
-# Historically set ~15bps below IORB (upper bound). e.g. IORB=3.65% → RRP=3.50%
-rrp_rate = iorb - 0.0015
+# Adjusted closes are restated on dividends/splits, so refetch the full window
+@disk_cached()
+def fetch_yahoo(tickers: list, start=START_RAW) -> pd.DataFrame:
+    """Batch-download adjusted daily bars for all Yahoo tickers."""
+    return yf.download(
+        tickers,
+        start=str(start),
+        end=str(TODAY + timedelta(days=1)),
+        auto_adjust=True,
+        progress=False,
+    )
+
 
-print("Fetching Yahoo Finance data...")
+FRED_SERIES = [
+    "WALCL", "WDTGAL", "RRPONTSYD", "WRESBAL",
+    "DFF", "SOFR", "IORB", "OBFR",
+    "DGS10", "DGS2", "DGS30", "DGS3MO", "DFII5", "DFII10", "T10YIE", "DCPF3M",
+    "NFCI", "DCOILWTICO", "DHHNGSP",
+]
 
 TICKERS = ["^VIX", "^VIX3M", "^OVX", "DX-Y.NYB",
            "SPY", "TLT", "IWM", "HYG", "LQD", "KRE", "IEF", "IEI"]
 
-raw_yahoo = yf.download(
-    TICKERS,
-    start=str(START_RAW),
-    end=str(TODAY + timedelta(days=1)),
-    auto_adjust=True,
-    progress=False,
-)
+prune_cache()
+
+# Every request is an independent HTTPS round-trip, so overlap them all
+# (the Yahoo batch download runs alongside the FRED calls)
+with ThreadPoolExecutor(max_workers=16) as pool:
+    yahoo_future = pool.submit(fetch_yahoo, TICKERS)
+    fred_futures = {sid: pool.submit(fetch_fred, sid) for sid in FRED_SERIES}
+    fred_data = {sid: fut.result() for sid, fut in fred_futures.items()}
+    raw_yahoo = yahoo_future.result()
+
+# Shared daily calendar: the dates the rate market actually printed, so weekends
+# and bond-market holidays drop out (bdate_range would keep the holidays)
+CALENDAR = fred_data["DGS10"].index.union(fred_data["SOFR"].index)
+if CALENDAR.empty:   # both fetches failed
+    CALENDAR = pd.bdate_range(START_RAW, TODAY)
+
+# Balance sheet / liquidity (weekly, fill forward onto the rate calendar)
+walcl   = to_daily(fred_data["WALCL"])       # $M → convert to $T
+wdtgal  = to_daily(fred_data["WDTGAL"])      # $M
+rrp     = to_daily(fred_data["RRPONTSYD"])   # $B daily
+wresbal = to_daily(fred_data["WRESBAL"])     # $M
+
+# Rates (daily): one aligned frame, %→ decimal in a single division
+RATE_SERIES = ["DFF", "SOFR", "IORB", "OBFR", "DGS10", "DGS2", "DGS30", "DGS3MO",
+               "DFII5", "DFII10", "T10YIE", "DCPF3M"]
+# On the shared calendar (no ffill): DFF and IORB also print weekends and holidays,
+# which would otherwise leave rows scored by their spread alone
+rates = pd.concat({sid: fred_data[sid] for sid in RATE_SERIES}, axis=1).reindex(CALENDAR) / 100
+
+# Each column keeps only its own observation dates
+dff   = rates["DFF"].dropna()
+sofr  = rates["SOFR"].dropna()
+iorb  = rates["IORB"].dropna()
+obfr  = rates["OBFR"].dropna()
+dgs10 = rates["DGS10"].dropna()
+dgs2  = rates["DGS2"].dropna()
+dgs30 = rates["DGS30"].dropna()
+dfii5  = rates["DFII5"].dropna()
+dfii10 = rates["DFII10"].dropna()
+t10yie = rates["T10YIE"].dropna()
+nfci   = to_daily(fred_data["NFCI"])
+wti    = fred_data["DCOILWTICO"]
+ng     = fred_data["DHHNGSP"]
+
+# ON RRP award rate = lower bound of fed funds target range
+# Historically set ~15bps below IORB (upper bound). e.g. IORB=3.65% → RRP=3.50%
+ON_RRP_OFFSET = 0.0015   # single source for every ON RRP rate derived from IORB
+rrp_rate = iorb - ON_RRP_OFFSET
 
 def yp(ticker: str) -> pd.Series:
     """Get adjusted close price series for a Yahoo ticker."""
@@ -285,7 +467,7 @@ def yp(ticker: str) -> pd.Series:
         else:
             s = raw_yahoo["Close"].dropna()
         s.index = pd.to_datetime(s.index)
-        return s
+        return s.astype(np.float32)
     except Exception as e:
         print(f"  WARN: Yahoo {ticker}: {e}")
         return pd.Series(dtype=float)
@@ -316,23 +498,31 @@ wresbal_b = wresbal / 1000
 # Fed Net Liquidity ($B)
 net_liq = walcl_b - wdtgal_b - rrp_b
 
-# 13-week (91-day) momentum of net liquidity
-net_liq_mom = net_liq - net_liq.shift(91)
+# 13-week (63 business-day) momentum of net liquidity
+net_liq_mom = net_liq - net_liq.shift(63)
 
-# TGA deviation from 52-week rolling median
-tga_deviation = wdtgal_b - wdtgal_b.rolling(365).median()
+# TGA deviation from 52-week (252 business-day) rolling median
+tga_deviation = wdtgal_b - rolling_median(wdtgal_b, 252)
 
 # ON RRP Buffer Risk (0–1, non-linear)
 on_rrp_risk = ((1 - rrp_b / 100).clip(lower=0) ** 0.5)
 
+# Rate spreads below are column arithmetic on the already-aligned `rates` frame,
+# so no operation re-joins indexes. A missing leg gives NaN, dropped per factor.
+ra = {sid: rates[sid].to_numpy() for sid in RATE_SERIES}
+
+def on_rates(arr: np.ndarray) -> pd.Series:
+    """Wrap a rates-frame column computation back into a dated Series."""
+    return pd.Series(arr, index=rates.index)
+
 # Corridor frictions (bps-level spreads)
-coll_repo   = sofr - obfr
-corr_fric_1 = sofr - iorb
-corr_fric_2 = sofr - rrp_rate
-effr_iorb   = dff  - iorb
+coll_repo   = on_rates(ra["SOFR"] - ra["OBFR"])
+corr_fric_1 = on_rates(ra["SOFR"] - ra["IORB"])
+corr_fric_2 = on_rates(ra["SOFR"] - (ra["IORB"] - ON_RRP_OFFSET))   # SOFR − ON RRP award rate
+effr_iorb   = on_rates(ra["DFF"]  - ra["IORB"])
 
-# CP-TBill spread
-cp_tbill = (dcpf3m - dgs3m).dropna()
+# CP-TBill spread (DCPF3M = 90d AA CP rate)
+cp_tbill = on_rates(ra["DCPF3M"] - ra["DGS3MO"]).dropna()
 
 # Funding fragmentation: 21-day std of spread triad
 # Scale to percent-point form (*100) so values match bhadial's ~0.1 range
@@ -343,21 +533,23 @@ spread_triad = pd.DataFrame({
     "cf2":     corr_fric_2 * 100,
 }).dropna()
 frag_mean = spread_triad.mean(axis=1)
-funding_frag = frag_mean.rolling(21).std()
+funding_frag = rolling_std(frag_mean, 21)
 
 # Treasury
-term_30_10 = dgs30 - dgs10
+term_30_10 = on_rates(ra["DGS30"] - ra["DGS10"])
+spread_10_2  = on_rates(ra["DGS10"] - ra["DGS2"])
+spread_10_3m = on_rates(ra["DGS10"] - ra["DGS3MO"])
 # Rate vol: 21D std of daily pct-point changes
 # dgs10 is in decimal (0.0404); multiply by 100 to get percent-point daily changes
 # NOTE: bhadial raw value ~0.09 suggests pct returns*10, but that gives worse percentile match
 # Keeping pct-point diff approach which gives closer percentile (score 88.7 vs bhadial 51.0)
 dgs10_chg_pct = dgs10.diff() * 100
-rate_vol_21   = dgs10_chg_pct.rolling(21).std()
-curve_curv    = (2 * dgs10 - dgs2 - dgs30).abs()
+rate_vol_21   = rolling_std(dgs10_chg_pct, 21)
+curve_curv    = on_rates(np.abs(2 * ra["DGS10"] - ra["DGS2"] - ra["DGS30"]))
 
 # Rates
-real_level = 0.6 * dfii5 + 0.4 * dfii10
-real_curve_10_5 = dfii10 - dfii5
+real_level = on_rates(0.6 * ra["DFII5"] + 0.4 * ra["DFII10"])
+real_curve_10_5 = on_rates(ra["DFII10"] - ra["DFII5"])
 
 # Credit: relative log returns (63-day)
 hy_credit  = rel_log_return(hyg, iei)
@@ -371,35 +563,78 @@ vix_ts     = vix / vix3m
 
 # External
 fx_rvol    = realized_vol(dxy.pct_change(), 63)
-oil_vol_dev = (ovx - ovx.rolling(252).median()).clip(lower=0)
+oil_vol_dev = (ovx - rolling_median(ovx, 252)).clip(lower=0)
 
 # ── Score pipeline ────────────────────────────────────────────────────────────
 
-def make_factor(factor_id: str, name: str, series: pd.Series,
+def score_all_factors(factor_series: dict) -> pd.DataFrame:
+    """
+    Daily score history for every factor at once. All series are aligned into one
+    (dates × factors) frame over the 5Y + 90d window and ranked column-wise in a
+    single call; NaN marks dates a factor has no observation.
+    """
+    if not factor_series:
+        return pd.DataFrame(dtype=float)
+    frame = pd.concat(factor_series, axis=1)   # float32 in; ranks are exact either way
+    frame = frame.iloc[np.searchsorted(frame.index.values, CUTOFF_SCORE):]
+    counts = frame.count()
+    # Average rank r among a column's n points = percentileofscore(kind="rank") * n / 100
+    pct = frame.rank(method="average").to_numpy() * 100.0 / counts.to_numpy()
+    invert = np.array([fid in INVERT_FACTORS for fid in frame.columns])
+    scores = score_of(pct, invert)
+    scores[:, (counts < 5).to_numpy()] = np.nan   # too short to score
+    scores = pd.DataFrame(scores, index=frame.index, columns=frame.columns)
+    # Module/overall sums count a missing score as 0, so keep only calendar days
+    # (drops e.g. Columbus Day, when Yahoo trades but the rate market is shut)
+    return scores[scores.index.isin(CALENDAR)]
+
+
+def weighted_score_ts(factor_scores: pd.DataFrame, ids: list, weights: np.ndarray) -> pd.Series:
+    """
+    Weighted sum of score columns as one matrix-vector product over the pre-aligned
+    score frame. A missing score counts as 0 and dates where none of the columns
+    is scored are dropped (same result as concat-ing the series and row-summing).
+    """
+    block = factor_scores[ids].to_numpy()
+    scored_rows = ~np.isnan(block).all(axis=1)
+    block = np.nan_to_num(block[scored_rows])
+    return pd.Series(block @ weights, index=factor_scores.index[scored_rows])
+
+
+def prepare_stats(series: pd.Series, score_series: pd.Series) -> SimpleNamespace:
+    """
+    Everything scored about one factor, computed once and shared by make_factor:
+      values, index   cleaned (NaN-free) observations as float64 + their dates
+      sorted          sorted 5Y window (current percentile + histogram)
+      raw_pct         current 5Y percentile
+      pct_dist        10-bucket histogram of the 5Y window
+      scores          daily score history (from score_all_factors)
+    """
+    values = series.to_numpy(dtype=np.float64)
+    sorted_hist = np.sort(values[np.searchsorted(series.index.values, CUTOFF_5Y):])
+    return SimpleNamespace(
+        values=values,
+        index=series.index,
+        sorted=sorted_hist,
+        raw_pct=pct_rank_sorted(sorted_hist, values[-1]),
+        pct_dist=percentile_dist(sorted_hist),
+        scores=score_series.to_numpy(),
+    )
+
+
+def make_factor(factor_id: str, name: str, stats: SimpleNamespace,
                 value_fmt: str = "{:.4f}", change_bps: bool = False,
                 is_extra: bool = False) -> dict:
-    """Build a complete Factor dict for the frontend."""
-    series = series.dropna()
-    if len(series) < 10:
-        return None
-
-    current = float(series.iloc[-1])
+    """Build a complete Factor dict for the frontend from prepare_stats() output."""
+    values, index, raw_pct, score_values = stats.values, stats.index, stats.raw_pct, stats.scores
+    current = float(values[-1])
 
     # 7-day ago value
-    past_idx = series.index.get_indexer([series.index[-1] - timedelta(days=7)], method="nearest")[0]
-    past_val = float(series.iloc[max(0, past_idx)])
+    past_val = float(values[nearest_position(index, index[-1] - timedelta(days=7))])
 
-    raw_pct   = pct_rank(series)
     score_val = score_from_pct(raw_pct, factor_id)
     status    = get_status(score_val)
-
-    # Score series for velocity
-    cutoff = TODAY - timedelta(days=365 * 5 + 90)
-    hist = series[series.index >= pd.Timestamp(cutoff)].dropna()
-    score_series = hist.apply(
-        lambda x: score_from_pct(float(percentileofscore(hist.values, x, kind="rank")), factor_id)
-    )
-    velocity = get_velocity(score_series)
+    velocity  = get_velocity(score_values)
 
     # Formatted value
     try:
@@ -409,6 +644,11 @@ def make_factor(factor_id: str, name: str, series: pd.Series,
 
     chg_str, chg_dir = fmt_change(current, past_val, bps=change_bps)
 
+    # Latest and 7-obs-ago scores for Lift/Drag (needs >= 9 points of score history)
+    has_7d = score_values.size >= 9
+    score_now = float(score_values[-1]) if has_7d else None
+    score_7d  = float(score_values[-8]) if has_7d else None
+
     return {
         "id":                   factor_id,
         "name":                 name,
@@ -418,42 +658,39 @@ def make_factor(factor_id: str, name: str, series: pd.Series,
         "historicalPercentile5Y": round(raw_pct, 1),
         "status":               status,
         "velocity":             velocity,
-        "trendData":            build_trend_data(series, 90),
-        "percentileData":       percentile_dist(series),
+        "trendData":            build_trend_data(values, index, 90),
+        "percentileData":       stats.pct_dist,
         "isExtra":              is_extra,
+        # Internal (stripped before the JSON dump)
+        "_score_now":           score_now,
+        "_score_7d":            score_7d,
     }
 
 
-def make_score_series(series: pd.Series, factor_id: str) -> pd.Series:
-    """Return daily score series for a factor (for score trend)."""
-    series = series.dropna()
-    cutoff = TODAY - timedelta(days=365 * 5 + 90)
-    hist = series[series.index >= pd.Timestamp(cutoff)].dropna()
-    if len(hist) < 5:
-        return pd.Series(dtype=float)
-    return hist.apply(
-        lambda x: score_from_pct(float(percentileofscore(hist.values, x, kind="rank")), factor_id)
-    )
-
-
 # ── Build modules ─────────────────────────────────────────────────────────────
 
 print("Scoring factors and building modules...")
 
-def build_module_obj(slug: str, name: str, factor_specs: list) -> tuple:
+def build_module_obj(slug: str, name: str, factor_specs: list,
+                     factor_series: dict, factor_scores: pd.DataFrame) -> tuple:
     """
     factor_specs: list of (factor_id, name, series, fmt, change_bps, is_extra)
+    factor_series: {factor_id: series}, cleaned once (NaN-free, >= 10 points)
+    factor_scores: score_all_factors() frame holding every factor's score history
     Returns (module_dict, {factor_id: score_series})
     """
     factors = []
     factor_score_series = {}
 
     for spec in factor_specs:
-        fid, fname, fseries, ffmt, fbps, fextra = spec
-        f = make_factor(fid, fname, fseries, ffmt, fbps, fextra)
-        if f:
-            factors.append(f)
-            factor_score_series[fid] = make_score_series(fseries, fid)
+        fid, fname, _, ffmt, fbps, fextra = spec
+        fseries = factor_series.get(fid)
+        if fseries is None:
+            continue
+        score_series = factor_scores[fid].dropna()
+        stats = prepare_stats(fseries, score_series)
+        factors.append(make_factor(fid, fname, stats, ffmt, fbps, fextra))
+        factor_score_series[fid] = score_series
 
     # Module score = weighted average of scored (non-extra) factors
     scored = [f for f in factors if not f["isExtra"]]
@@ -461,26 +698,17 @@ def build_module_obj(slug: str, name: str, factor_specs: list) -> tuple:
         return None, {}
 
     fw = FACTOR_WEIGHTS.get(slug, {})
-    scored_scores = []
-    scored_weights = []
-    for f in scored:
-        fid = f["id"]
-        s = score_from_pct(f["historicalPercentile5Y"], fid)
-        w = fw.get(fid, 1.0 / len(scored))
-        scored_scores.append(s)
-        scored_weights.append(w)
-    w_total = sum(scored_weights)
-    module_score = round(sum(s * w for s, w in zip(scored_scores, scored_weights)) / w_total, 1)
+    pcts = np.fromiter((f["historicalPercentile5Y"] for f in scored), dtype=np.float64, count=len(scored))
+    invert = np.array([f["id"] in INVERT_FACTORS for f in scored])
+    score_weights = np.array([fw.get(f["id"], 1.0 / len(scored)) for f in scored])
+    module_score = round(float(np.average(score_of(pcts, invert), weights=score_weights)), 1)
 
     # Build module score time series (weighted average of scored factor score series)
     scored_ids = [f["id"] for f in scored]
     valid_ids = [fid for fid in scored_ids if fid in factor_score_series and len(factor_score_series[fid]) > 0]
-    ss_list = [factor_score_series[fid] for fid in valid_ids]
-    if ss_list:
-        df = pd.concat(ss_list, axis=1)
+    if valid_ids:
         weights = np.array([fw.get(fid, 1.0 / len(valid_ids)) for fid in valid_ids])
-        weights = weights / weights.sum()
-        mod_score_ts = (df * weights).sum(axis=1).dropna()
+        mod_score_ts = weighted_score_ts(factor_scores, valid_ids, weights / weights.sum())
     else:
         mod_score_ts = pd.Series(dtype=float)
 
@@ -491,18 +719,19 @@ def build_module_obj(slug: str, name: str, factor_specs: list) -> tuple:
     mod_pct = round(pct_rank(mod_score_ts), 1) if len(mod_score_ts) > 10 else 50.0
 
     # Previous score (7 days ago)
-    if len(mod_score_ts) > 7:
-        prev_score = round(float(mod_score_ts.iloc[-8]), 1)
+    ts_vals = mod_score_ts.to_numpy()
+    if ts_vals.size > 7:
+        prev_score = round(float(ts_vals[-8]), 1)
     else:
         prev_score = module_score
 
     change_pct = round((module_score - prev_score) / max(prev_score, 0.01) * 100, 2)
 
     # Trend direction
-    recent = mod_score_ts.tail(3)
-    if len(recent) >= 2 and recent.iloc[-1] > recent.iloc[0] + 1:
+    recent = ts_vals[-3:]
+    if recent.size >= 2 and recent[-1] > recent[0] + 1:
         trend_dir = "improving"
-    elif len(recent) >= 2 and recent.iloc[-1] < recent.iloc[0] - 1:
+    elif recent.size >= 2 and recent[-1] < recent[0] - 1:
         trend_dir = "declining"
     else:
         trend_dir = "stable"
@@ -564,8 +793,8 @@ all_specs = {
         ("30y-10y-term-premium",   "30Y-10Y Term Premium",       term_30_10,    "{:.2%}",      True,  False),
         ("10y-rate-volatility",    "10Y Rate Volatility (21D)",  rate_vol_21,   "{:.4f}",      False, False),
         ("curve-curvature",        "Curve Curvature (Abs)",      curve_curv,    "{:.4%}",      True,  False),
-        ("10y-2y-spread",          "10Y-2Y Spread",              dgs10-dgs2,    "{:.2%}",      True,  True),
-        ("10y-3m-spread",          "10Y-3M Spread",              dgs10-dgs3m,   "{:.2%}",      True,  True),
+        ("10y-2y-spread",          "10Y-2Y Spread",              spread_10_2,   "{:.2%}",      True,  True),
+        ("10y-3m-spread",          "10Y-3M Spread",              spread_10_3m,  "{:.2%}",      True,  True),
         ("10y-nominal-rate",       "10Y Nominal Rate",           dgs10,         "{:.2%}",      True,  True),
         ("30y-rate",               "30Y Rate",                   dgs30,         "{:.2%}",      True,  True),
         ("2y-rate",                "2Y Rate",                    dgs2,          "{:.2%}",      True,  True),
@@ -599,12 +828,20 @@ all_specs = {
     ]),
 }
 
+# Clean every factor series once, then score all histories in one pass over a
+# single aligned frame
+factor_series = {fid: fseries.dropna()
+                 for _, specs in all_specs.values()
+                 for fid, _, fseries, *_ in specs}
+factor_series = {fid: s for fid, s in factor_series.items() if len(s) >= 10}
+factor_scores = score_all_factors(factor_series)
+
 # Build all modules
 modules = {}
 all_factor_score_series = {}
 for slug, (mname, specs) in all_specs.items():
     print(f"  Building module: {slug}")
-    mod, fss = build_module_obj(slug, mname, specs)
+    mod, fss = build_module_obj(slug, mname, specs, factor_series, factor_scores)
     if mod:
         modules[slug] = mod
         all_factor_score_series.update(fss)
@@ -626,8 +863,10 @@ prev_overall = round(sum(
     if slug in modules
 ), 1)
 
-# Overall score trend series (factor-weighted module scores, then module-weighted)
-overall_score_ts_parts = []
+# Overall score trend series (factor-weighted module scores, then module-weighted).
+# Each factor column carries its normalized in-module weight × module weight, so
+# one product over the score frame gives the overall score.
+col_weights = {}
 for slug, w in MODULE_WEIGHTS.items():
     if slug not in modules:
         continue
@@ -635,16 +874,14 @@ for slug, w in MODULE_WEIGHTS.items():
     scored_ids = [f["id"] for f in modules[slug]["factors"] if not f["isExtra"]]
     valid_ids = [fid for fid in scored_ids
                  if fid in all_factor_score_series and len(all_factor_score_series[fid]) > 0]
-    ss_list = [all_factor_score_series[fid] for fid in valid_ids]
-    if ss_list:
-        df = pd.concat(ss_list, axis=1)
+    if valid_ids:
         f_weights = np.array([fw.get(fid, 1.0 / len(valid_ids)) for fid in valid_ids])
         f_weights = f_weights / f_weights.sum()
-        mod_ts = (df * f_weights).sum(axis=1) * w
-        overall_score_ts_parts.append(mod_ts)
+        col_weights.update(zip(valid_ids, f_weights * w))
 
-if overall_score_ts_parts:
-    overall_ts = pd.concat(overall_score_ts_parts, axis=1).sum(axis=1).dropna()
+if col_weights:
+    overall_ts = weighted_score_ts(factor_scores, list(col_weights),
+                                   np.fromiter(col_weights.values(), dtype=np.float64))
 else:
     overall_ts = pd.Series(dtype=float)
 
@@ -654,10 +891,10 @@ overall_trend = build_score_trend(overall_ts, 90)
 overall_pct = round(pct_rank(overall_ts), 1) if len(overall_ts) > 10 else 50.0
 
 # Trend direction
-rec = overall_ts.tail(3)
-if len(rec) >= 2 and rec.iloc[-1] > rec.iloc[0] + 0.5:
+rec = overall_ts.to_numpy()[-3:]
+if rec.size >= 2 and rec[-1] > rec[0] + 0.5:
     overall_trend_dir = "improving"
-elif len(rec) >= 2 and rec.iloc[-1] < rec.iloc[0] - 0.5:
+elif rec.size >= 2 and rec[-1] < rec[0] - 0.5:
     overall_trend_dir = "declining"
 else:
     overall_trend_dir = "stable"
@@ -666,31 +903,29 @@ else:
 
 print("Computing Lift/Drag attribution...")
 
-lift_drag = []
+ld_names, ld_pts = [], []
 for slug, w in MODULE_WEIGHTS.items():
     if slug not in modules:
         continue
     fw = FACTOR_WEIGHTS.get(slug, {})
     scored = [f for f in modules[slug]["factors"] if not f["isExtra"]]
     for f in scored:
-        fid = f["id"]
-        if fid not in all_factor_score_series:
-            continue
-        ss = all_factor_score_series[fid].dropna()
-        if len(ss) < 9:
-            continue
-        factor_w = fw.get(fid, 1.0 / len(scored)) * w
-        score_now  = float(ss.iloc[-1])
-        score_7d   = float(ss.iloc[-8]) if len(ss) > 8 else score_now
-        contrib    = (score_now - score_7d) * factor_w
-        lift_drag.append({"name": f["name"], "pts": round(contrib, 2)})
+        if f["_score_now"] is not None:
+            ld_names.append(f["name"])
+            ld_pts.append(round((f["_score_now"] - f["_score_7d"]) * (fw.get(f["id"], 1.0 / len(scored)) * w), 2))
 
-lift_drag.sort(key=lambda x: x["pts"], reverse=True)
-score_lift = [i for i in lift_drag if i["pts"] > 0]
-score_drag = [i for i in lift_drag if i["pts"] < 0]
+# Descending by pts; a stable argsort keeps ties in module order like list.sort did
+order = np.argsort(-np.array(ld_pts, dtype=np.float64), kind="stable")
+ranked = [(ld_names[i], ld_pts[i]) for i in order]
+score_lift = [{"name": n, "pts": p} for n, p in ranked if p > 0]
+score_drag = [{"name": n, "pts": p} for n, p in ranked if p < 0]
 
 # ── Assemble final dashboard JSON ─────────────────────────────────────────────
 
+# Strip internal underscore keys from the factor dicts
+for mod in modules.values():
+    mod["factors"] = [{k: v for k, v in f.items() if not k.startswith("_")} for f in mod["factors"]]
+
 dashboard = {
     "score":          overall_score,
     "prevScore":      prev_overall,
@@ -706,8 +941,10 @@ dashboard = {
 }
 
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-with open(OUTPUT_PATH, "w") as f:
-    json.dump(dashboard, f, indent=2, default=str)
+json_opts = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+if os.getenv("DASHBOARD_PRETTY"):   # indented output for local debugging
+    json_opts |= orjson.OPT_INDENT_2
+OUTPUT_PATH.write_bytes(orjson.dumps(dashboard, option=json_opts))
 
 print(f"\n✓ Done! Written to {OUTPUT_PATH}")
 print(f"  Overall Score: {overall_score} (prev: {prev_overall})")